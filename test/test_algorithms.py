@@ -6,10 +6,13 @@ __date__ = "2008-03-12 -- 2009-01-28"
 
 import pytest
 
-from ufl import (Argument, Coefficient, FacetNormal, FunctionSpace, Mesh, TestFunction, TrialFunction, adjoint, div,
-                 dot, ds, dx, grad, inner, triangle)
+from ufl import (Argument, Coefficient, Constant, FacetNormal, FunctionSpace, Mesh, TestFunction, TrialFunction,
+                 adjoint, div, dot, ds, dx, grad, inner, triangle)
 from ufl.algorithms import (expand_derivatives, expand_indices, extract_arguments, extract_coefficients,
-                            extract_elements, extract_unique_elements)
+                            extract_elements, extract_type, extract_unique_elements)
+from ufl.algorithms.analysis import extract_arguments_coefficients_and_constants, has_type
+from ufl.argument import BaseArgument
+from ufl.classes import Grad, Operator, Product, Sum
 from ufl.corealg.traversal import post_traversal, pre_traversal, unique_post_traversal, unique_pre_traversal
 from ufl.finiteelement import FiniteElement
 from ufl.pullback import identity_pullback
@@ -67,6 +70,37 @@ def test_extract_coefficients_vs_fixture(coefficients, forms):
     assert coefficients == tuple(extract_coefficients(forms[2]))
 
 
+def test_extract_from_form_matches_integrands(forms):
+    b = forms[2]
+    integrands = [itg.integrand() for itg in b.integrals()]
+    assert extract_coefficients(b) == extract_coefficients(sum(integrands))
+    assert extract_arguments(b) == extract_arguments(sum(integrands))
+    # Repeated extraction reuses the analysis cached on the form
+    assert extract_coefficients(b) == list(b.coefficients())
+
+
+def test_extract_arguments_coefficients_and_constants(arguments, coefficients, domain):
+    v, u = arguments
+    c, f = coefficients
+    k = Constant(domain)
+    a = k * f * u * v * dx + c * v * dx
+    assert extract_arguments_coefficients_and_constants(a) == ([v, u], [c, f], [k])
+    assert a.constants() == [k]
+
+
+def test_extract_type_and_has_type(arguments, coefficients, forms):
+    v, u = arguments
+    c, f = coefficients
+    a, L, b = forms
+    assert extract_type(a, BaseArgument) == {v, u}
+    assert extract_type(L, [Coefficient, Argument]) == {f, v}
+    assert all(isinstance(o, Operator) for o in extract_type(b, Operator))
+    assert has_type(b, Grad)
+    assert has_type(a, Product)
+    assert not has_type(a, Sum)
+    assert not has_type(L, Grad)
+
+
 def test_extract_elements_and_extract_unique_elements(forms, element, domain):
     b = forms[2]
     integrals = b.integrals_by_type("cell")
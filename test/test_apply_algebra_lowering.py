@@ -1,8 +1,13 @@
+import gc
+import weakref
+
 import pytest
 
-from ufl import Coefficient, FunctionSpace, Index, Mesh, as_tensor, interval, sqrt, triangle
+from ufl import (Coefficient, FunctionSpace, Identity, Index, Mesh, as_tensor, as_vector, indices, interval, sqrt,
+                 triangle)
 from ufl.algorithms.renumbering import renumber_indices
 from ufl.compound_expressions import cross_expr, determinant_expr, inverse_expr
+from ufl.constantvalue import IntValue, Zero, zero
 from ufl.finiteelement import FiniteElement
 from ufl.pullback import identity_pullback
 from ufl.sobolevspace import H1
@@ -75,6 +80,20 @@ def test_determinant3(A3):
                                     + A3[0, 2]*(A3[1, 0]*A3[2, 1] - A3[1, 1]*A3[2, 0]))
 
 
+def test_determinant_identity():
+    assert determinant_expr(Identity(3)) == IntValue(1)
+
+
+def test_cross_zero(A3):
+    assert cross_expr(zero((3,)), A3[:, 0]) == zero((3,))
+    assert cross_expr(as_vector((1, 2, 3)), zero((3,))) == zero((3,))
+    i, j = indices(2)
+    b = as_tensor(A3[i, j], (j,))
+    c = cross_expr(zero((3,)), b)
+    assert c == Zero((3,), b.ufl_free_indices, b.ufl_index_dimensions)
+    assert c.ufl_free_indices == (i.count(),)
+
+
 def test_pseudo_determinant21(A21):
     i = Index()
     assert renumber_indices(determinant_expr(A21)) == renumber_indices(sqrt(A21[i, 0]*A21[i, 0]))
@@ -124,3 +143,15 @@ def xtest_pseudo_inverse31(A31):
 def xtest_pseudo_inverse32(A32):
     expected = "TODO"
     assert renumber_indices(inverse_expr(A32)) == renumber_indices(expected)
+
+
+def test_compound_expressions_do_not_retain_arguments():
+    B = Coefficient(FunctionSpace(
+        Mesh(FiniteElement("Lagrange", triangle, 1, (2, ), identity_pullback, H1)),
+        FiniteElement("Lagrange", triangle, 1, (2, 2), identity_pullback, H1)))
+    ref = weakref.ref(B)
+    inverse_expr(B)
+    determinant_expr(B)
+    del B
+    gc.collect()
+    assert ref() is None
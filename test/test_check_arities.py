@@ -2,7 +2,7 @@ import pytest
 
 from ufl import (Coefficient, FacetNormal, FunctionSpace, Mesh, SpatialCoordinate, TestFunction, TrialFunction, adjoint,
                  cofac, conj, derivative, ds, dx, grad, inner, tetrahedron)
-from ufl.algorithms.check_arities import ArityMismatch
+from ufl.algorithms.check_arities import ArityMismatch, check_integrand_arity
 from ufl.algorithms.compute_form_data import compute_form_data
 from ufl.finiteelement import FiniteElement
 from ufl.pullback import identity_pullback
@@ -52,3 +52,17 @@ def test_complex_arities():
 
     with pytest.raises(ArityMismatch):
         compute_form_data(inner(conj(v), u) * dx, complex_mode=True)
+
+
+def test_integrand_arities_without_arguments():
+    cell = tetrahedron
+    D = Mesh(FiniteElement("Lagrange", cell, 1, (3, ), identity_pullback, H1))
+    V = FunctionSpace(D, FiniteElement("Lagrange", cell, 2, (3, ), identity_pullback, H1))
+    v = TestFunction(V)
+    f = Coefficient(V)
+
+    # A functional integrand has no arguments
+    check_integrand_arity(inner(f, f), [])
+
+    with pytest.raises(ArityMismatch):
+        check_integrand_arity(inner(f, f), [v])
@@ -141,6 +141,12 @@ def test_join_domains():
     assert 2 == len(join_domains([Mesh(xa, ufl_id=7), Mesh(xa, ufl_id=8)]))
     assert 2 == len(join_domains([Mesh(xa), Mesh(xb)]))
 
+    # Joined domains keep their initial ordering, None is ignored
+    D7 = Mesh(xa, ufl_id=7)
+    D8 = Mesh(xa, ufl_id=8)
+    assert join_domains([D8, None, D7, D8]) == (D8, D7)
+    assert join_domains([None]) == ()
+
     # Incompatible coordinates require labeling
     xc = Coefficient(FunctionSpace(
         Mesh(FiniteElement("Lagrange", triangle, 1, (2, ), identity_pullback, H1)),
@@ -8,8 +8,8 @@ import math
 
 import pytest
 
-from ufl import (Coefficient, FunctionSpace, Identity, Mesh, as_tensor, cos, det, div, dot, dx, exp, grad, i, inner, j,
-                 k, l, ln, nabla_div, nabla_grad, outer, sin, triangle)
+from ufl import (Coefficient, FunctionSpace, Identity, Mesh, as_tensor, as_vector, cos, det, div, dot, dx, exp, grad, i,
+                 inner, j, k, l, ln, nabla_div, nabla_grad, outer, sin, triangle)
 from ufl.algorithms import compute_form_data, expand_derivatives, expand_indices
 from ufl.algorithms.renumbering import renumber_indices
 from ufl.finiteelement import FiniteElement
@@ -206,6 +206,38 @@ def test_expand_indices_index_sum(self, fixt):
     compare(tf[i, i], 11 + 19)
     compare(tf[i, j]*(tf[j, i]+outer(vf, vf)[i, j]), (5*5+11)*11 + (7*5+17)*13 + (7*5+13)*17 + (7*7+19)*19)
     compare(as_tensor(as_tensor(tf[i, j], (i, j))[k, l], (l, k))[i, i], 11 + 19)
+    compare(as_tensor([[vf[0], vf[1]], [tf[1, 0], 3]])[i, j]*tf[i, j], 5*11 + 7*13 + 17*17 + 3*19)
+
+
+def test_expand_indices_shared_subexpressions(self, fixt):
+    vf = fixt.vf
+    tf = fixt.tf
+    compare = fixt.compare
+
+    # The same subexpression expanded with different index values
+    A = tf[i, j]*vf[j]
+    compare(A*A, (11*5 + 13*7)**2 + (17*5 + 19*7)**2)
+    B = as_tensor(A, (i,))
+    compare(B[0] + B[1] * B[0], (11*5 + 13*7) + (17*5 + 19*7) * (11*5 + 13*7))
+
+
+def test_expand_indices_deep_expression(self, fixt):
+    vf = fixt.vf
+
+    # Deeper than the recursion limit
+    e = vf[0]
+    for _ in range(3000):
+        e = sin(e) * vf[1]
+    assert expand_indices(e) == e
+
+
+def test_expand_indices_list_tensor_component_mismatch(self, fixt):
+    vf = fixt.vf
+
+    with pytest.raises(ValueError):
+        expand_indices(as_vector([vf[0], 2 * vf[0]]))
+    with pytest.raises(ValueError):
+        expand_indices(dot(as_vector([vf[0], 2 * vf[0]]), as_vector([vf[1], vf[1]])))
 
 
 def test_expand_indices_derivatives(self, fixt):
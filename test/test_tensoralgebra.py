@@ -189,12 +189,33 @@ def test_det(self, A):
     self.assertEqualValues(C, D)
 
 
+def laplace_det(M):
+    if len(M) == 1:
+        return M[0][0]
+    return sum((-1)**j * M[0][j] * laplace_det([row[:j] + row[j+1:] for row in M[1:]]) for j in range(len(M)))
+
+
+def test_det_nxn(self):
+    for M in ([[2, 3, 1, 5], [4, 5, 7, 1], [3, 1, 2, 6], [1, 8, 3, 2]],
+              [[2, 3, 1, 5, 7], [4, 5, 7, 1, 2], [3, 1, 2, 6, 4], [1, 8, 3, 2, 5], [6, 2, 4, 1, 3]]):
+        assert float(det(as_matrix(M))) == laplace_det(M)
+
+
 def test_cofac(self, A):
     C = cofac(A)
     D = as_matrix([[(-A[i, j] if i != j else A[i, j]) for j in (-1, 0)] for i in (-1, 0)])
     self.assertEqualValues(C, D)
 
 
+def test_cofac_4x4(self):
+    M = [[2, 3, 1, 5], [4, 5, 7, 1], [3, 1, 2, 6], [1, 8, 3, 2]]
+    C = cofac(as_matrix(M))
+    for i in range(4):
+        for j in range(4):
+            minor = [row[:j] + row[j+1:] for row in M[:i] + M[i+1:]]
+            assert float(C[i, j]) == (-1)**(i + j) * laplace_det(minor)
+
+
 def xtest_inv(self, A):
     # FIXME: Test fails probably due to integer division
     C = inv(A)
@@ -163,3 +163,12 @@ def test_stackdict():
     assert d["a"] == 2
     d.pop()
     assert d["a"] == 1
+
+
+def test_balanced_sum():
+    from ufl.utils.sequences import balanced_sum
+    assert balanced_sum([]) == 0
+    assert balanced_sum([3]) == 3
+    assert balanced_sum(range(10)) == 45
+    assert balanced_sum(["a", "b", "c", "d", "e"]) == "abcde"
+    assert balanced_sum([[1], [2], [3], [4]]) == [1, 2, 3, 4]
@@ -16,6 +16,7 @@ from ufl.argument import BaseArgument, Coargument
 from ufl.coefficient import BaseCoefficient
 from ufl.constant import Constant
 from ufl.core.base_form_operator import BaseFormOperator
+from ufl.core.expr import Expr
 from ufl.core.terminal import Terminal
 from ufl.corealg.traversal import traverse_unique_terminals, unique_pre_traversal
 from ufl.form import BaseForm, Form
@@ -41,6 +42,23 @@ def unique_tuple(objects):
     return tuple(unique_objects)
 
 
+# Cache of typecode:bool lookup tables, keyed by tuples of types
+_typecode_tables = {}
+
+
+def _typecode_table(ufl_types):
+    """Return a list mapping each typecode to whether its class is a subclass of any of ufl_types.
+
+    The table is rebuilt if new UFL types have been defined since it was cached.
+    """
+    classes = Expr._ufl_all_classes_
+    table = _typecode_tables.get(ufl_types)
+    if table is None or len(table) != len(classes):
+        table = [issubclass(c, ufl_types) for c in classes]
+        _typecode_tables[ufl_types] = table
+    return table
+
+
 # --- Utilities to extract information from an expression ---
 
 def extract_type(a, ufl_types):
@@ -53,7 +71,9 @@ def extract_type(a, ufl_types):
     Returns:
         All objects found in a whose class is in ufl_type
     """
-    if not isinstance(ufl_types, (list, tuple)):
+    if isinstance(ufl_types, (list, tuple)):
+        ufl_types = tuple(ufl_types)
+    else:
         ufl_types = (ufl_types,)
 
     if all(t is not BaseFormOperator for t in ufl_types):
@@ -74,38 +94,38 @@ def extract_type(a, ufl_types):
             objects.update([e for e in a.coefficients() if isinstance(e, coeff_types)])
         return objects
 
+    # Typecode based lookup instead of isinstance checks for each node
+    is_wanted = _typecode_table(ufl_types)
     if all(issubclass(t, Terminal) for t in ufl_types):
         # Optimization
-        objects = set(o for e in iter_expressions(a)
-                      for o in traverse_unique_terminals(e)
-                      if any(isinstance(o, t) for t in ufl_types))
+        traversal = traverse_unique_terminals
     else:
-        objects = set(o for e in iter_expressions(a)
-                      for o in unique_pre_traversal(e)
-                      if any(isinstance(o, t) for t in ufl_types))
+        traversal = unique_pre_traversal
+    objects = {o for e in iter_expressions(a) for o in traversal(e) if is_wanted[o._ufl_typecode_]}
 
     # Need to extract objects contained in base form operators whose type is in ufl_types
-    base_form_ops = set(e for e in objects if isinstance(e, BaseFormOperator))
+    is_base_form_op = _typecode_table((BaseFormOperator,))
+    base_form_ops = {e for e in objects if is_base_form_op[e._ufl_typecode_]}
     ufl_types_no_args = tuple(t for t in ufl_types if not issubclass(t, BaseArgument))
-    base_form_objects = ()
+    base_form_objects = set()
     for o in base_form_ops:
         # This accounts for having BaseFormOperator in Forms: if N is a BaseFormOperator
         # `N(u; v*) * v * dx` <=> `action(v1 * v * dx, N(...; v*))`
         # where `v`, `v1` are `Argument`s and `v*` a `Coargument`.
-        for ai in tuple(arg for arg in o.argument_slots(isinstance(a, Form))):
+        for ai in o.argument_slots(isinstance(a, Form)):
             # Extracting BaseArguments of an object of which a Coargument is an argument,
             # then we just return the dual argument of the Coargument and not its primal argument.
             if isinstance(ai, Coargument):
                 new_types = tuple(Coargument if t is BaseArgument else t for t in ufl_types)
-                base_form_objects += tuple(extract_type(ai, new_types))
+                base_form_objects.update(extract_type(ai, new_types))
             else:
-                base_form_objects += tuple(extract_type(ai, ufl_types))
+                base_form_objects.update(extract_type(ai, ufl_types))
         # Look for BaseArguments in BaseFormOperator's argument slots only since that's where they are by definition.
         # Don't look into operands, which is convenient for external operator composition, e.g. N1(N2; v*)
         # where N2 is seen as an operator and not a form.
         slots = o.ufl_operands
         for ai in slots:
-            base_form_objects += tuple(extract_type(ai, ufl_types_no_args))
+            base_form_objects.update(extract_type(ai, ufl_types_no_args))
     objects.update(base_form_objects)
 
     # `Remove BaseFormOperator` objects if there were initially not in `ufl_types`
@@ -124,12 +144,13 @@ def has_type(a, ufl_type):
     Returns:
         Whether an object of class ufl_type can be found in a
     """
+    is_wanted = _typecode_table((ufl_type,))
     if issubclass(ufl_type, Terminal):
         # Optimization
         traversal = traverse_unique_terminals
     else:
         traversal = unique_pre_traversal
-    return any(isinstance(o, ufl_type) for e in iter_expressions(a) for o in traversal(e))
+    return any(is_wanted[o._ufl_typecode_] for e in iter_expressions(a) for o in traversal(e))
 
 
 def has_exact_type(a, ufl_type):
@@ -157,6 +178,9 @@ def extract_arguments(a):
     Args:
         a: A BaseForm, Integral or Expr
     """
+    if isinstance(a, Form):
+        # Reuse the cached analysis of the form
+        return _sorted_by_number_and_part(a.arguments())
     return _sorted_by_number_and_part(extract_type(a, BaseArgument))
 
 
@@ -166,6 +190,9 @@ def extract_coefficients(a):
     Args:
         a: A BaseForm, Integral or Expr
     """
+    if isinstance(a, Form):
+        # Reuse the cached analysis of the form
+        return list(a.coefficients())
     return sorted_by_count(extract_type(a, BaseCoefficient))
 
 
@@ -175,6 +202,9 @@ def extract_constants(a):
     Args:
         a: A BaseForm, Integral or Expr
     """
+    if isinstance(a, Form):
+        # Reuse the cached analysis of the form
+        return list(a.constants())
     return sorted_by_count(extract_type(a, Constant))
 
 
@@ -184,6 +214,9 @@ def extract_base_form_operators(a):
     Args:
         a: A BaseForm, Integral or Expr
     """
+    if isinstance(a, Form):
+        # Reuse the cached analysis of the form
+        return list(a.base_form_operators())
     return sorted_by_count(extract_type(a, BaseFormOperator))
 
 
@@ -196,10 +229,27 @@ def extract_arguments_and_coefficients(a):
     Args:
         a: A BaseForm, Integral or Expr
     """
-    # Extract lists of all BaseArgument and BaseCoefficient instances
-    base_coeff_and_args = extract_type(a, (BaseArgument, BaseCoefficient))
-    arguments = [f for f in base_coeff_and_args if isinstance(f, BaseArgument)]
-    coefficients = [f for f in base_coeff_and_args if isinstance(f, BaseCoefficient)]
+    if isinstance(a, Form):
+        # Reuse the cached analysis of the form
+        return _sorted_by_number_and_part(a.arguments()), list(a.coefficients())
+    arguments, coefficients, _ = extract_arguments_coefficients_and_constants(a)
+    return arguments, coefficients
+
+
+def extract_arguments_coefficients_and_constants(a):
+    """Build three sorted lists of all arguments, coefficients and constants in a.
+
+    This function is faster than extract_arguments_and_coefficients +
+    extract_constants for large forms, as a is only traversed once.
+
+    Args:
+        a: A BaseForm, Integral or Expr
+    """
+    # Extract lists of all BaseArgument, BaseCoefficient and Constant instances
+    objects = extract_type(a, (BaseArgument, BaseCoefficient, Constant))
+    arguments = [f for f in objects if isinstance(f, BaseArgument)]
+    coefficients = [f for f in objects if isinstance(f, BaseCoefficient)]
+    constants = [f for f in objects if isinstance(f, Constant)]
 
     # Build number,part: instance mappings, should be one to one
     bfnp = dict((f, (f.number(), f.part())) for f in arguments)
@@ -219,14 +269,15 @@ def extract_arguments_and_coefficients(a):
     # Passed checks, so we can safely sort the instances by count
     arguments = _sorted_by_number_and_part(arguments)
     coefficients = sorted_by_count(coefficients)
+    constants = sorted_by_count(constants)
 
-    return arguments, coefficients
+    return arguments, coefficients, constants
 
 
 def extract_elements(form):
     """Build sorted tuple of all elements used in form."""
-    args = chain(*extract_arguments_and_coefficients(form))
-    return tuple(f.ufl_element() for f in args)
+    arguments, coefficients = extract_arguments_and_coefficients(form)
+    return tuple(f.ufl_element() for f in chain(arguments, coefficients))
 
 
 def extract_unique_elements(form):
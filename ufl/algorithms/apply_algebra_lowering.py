@@ -22,6 +22,17 @@ class LowerCompoundAlgebra(MultiFunction):
     def __init__(self):
         """Initialize."""
         MultiFunction.__init__(self)
+        # Lowered determinants, cofactors and inverses, shared between
+        # all integrands of the form being lowered
+        self._compound_cache = {}
+
+    def _lower_compound(self, o, lower, A):
+        """Lower o to lower(A), reusing the result if o has been lowered before."""
+        r = self._compound_cache.get(o)
+        if r is None:
+            r = lower(A)
+            self._compound_cache[o] = r
+        return r
 
     ufl_type = MultiFunction.reuse_if_untouched
 
@@ -91,15 +102,15 @@ class LowerCompoundAlgebra(MultiFunction):
 
     def determinant(self, o, A):
         """Lower a determinant."""
-        return determinant_expr(A)
+        return self._lower_compound(o, determinant_expr, A)
 
     def cofactor(self, o, A):
         """Lower a cofactor."""
-        return cofactor_expr(A)
+        return self._lower_compound(o, cofactor_expr, A)
 
     def inverse(self, o, A):
         """Lower an inverse."""
-        return inverse_expr(A)
+        return self._lower_compound(o, inverse_expr, A)
 
     # ------------ Compound differential operators
 
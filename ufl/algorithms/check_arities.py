@@ -17,6 +17,12 @@ def _afmt(atuple):
     return tuple(f"conj({arg})" if conj else str(arg) for arg, conj in atuple)
 
 
+def _arity_sort_key(x):
+    """Return the key sorting (argument, conj) pairs by argument number and part."""
+    arg = x[0]
+    return (arg.number(), arg.part())
+
+
 class ArityChecker(MultiFunction):
     """Arity checker."""
 
@@ -64,20 +70,14 @@ class ArityChecker(MultiFunction):
         if a and b:
             # Check that we don't have test*test, trial*trial, even
             # for different parts in a block system
-            anumbers = set(x[0].number() for x in a)
-            for x in b:
-                if x[0].number() in anumbers:
-                    raise ArityMismatch("Multiplying expressions with overlapping form argument number "
-                                        f"{x[0].number()}, argument is {_afmt(x)}.")
-            # Combine argument lists
-            c = tuple(sorted(set(a + b), key=lambda x: (x[0].number(), x[0].part())))
-            # Check that we don't have any arguments shared between a
-            # and b
-            if len(c) != len(a) + len(b) or len(c) != len({x[0] for x in c}):
-                raise ArityMismatch("Multiplying expressions with overlapping form arguments "
-                                    f"{_afmt(a)} vs {_afmt(b)}.")
-            # It's fine for argument parts to overlap
-            return c
+            anumbers = {x[0].number() for x in a}
+            if not anumbers.isdisjoint([x[0].number() for x in b]):
+                x = next(x for x in b if x[0].number() in anumbers)
+                raise ArityMismatch("Multiplying expressions with overlapping form argument number "
+                                    f"{x[0].number()}, argument is {_afmt((x,))}.")
+            # Combine argument lists, the argument numbers of a and b
+            # are disjoint so the concatenation has no duplicates
+            return tuple(sorted(a + b, key=_arity_sort_key))
         elif a:
             return a
         else:
@@ -153,30 +153,38 @@ class ArityChecker(MultiFunction):
 
     def list_tensor(self, o, *ops):
         """Apply to list_tensor."""
-        args = set(chain(*ops))
+        args = set(chain.from_iterable(ops))
         if args:
             # Check that each list tensor component has the same
             # argument numbers (ignoring parts)
-            numbers = set(tuple(sorted(set(arg[0].number() for arg in op))) for op in ops)
-            if () in numbers:  # Allow e.g. <v[0], 0, v[1]> but not <v[0], u[0]>
-                numbers.remove(())
+            numbers = {frozenset(arg[0].number() for arg in op) for op in ops}
+            # Allow e.g. <v[0], 0, v[1]> but not <v[0], u[0]>
+            numbers.discard(frozenset())
             if len(numbers) > 1:
+                numbers = set(tuple(sorted(n)) for n in numbers)
                 raise ArityMismatch("Listtensor components must depend on the same argument numbers, "
                                     f"found {numbers}.")
 
             # Allow different parts with the same number
-            return tuple(sorted(args, key=lambda x: (x[0].number(), x[0].part())))
+            return tuple(sorted(args, key=_arity_sort_key))
         else:
             # No argument dependencies
             return self._et
 
 
-def check_integrand_arity(expr, arguments, complex_mode=False):
-    """Check the arity of an integrand."""
-    arguments = tuple(sorted(set(arguments),
-                             key=lambda x: (x.number(), x.part())))
-    rules = ArityChecker(arguments)
-    arg_tuples = map_expr_dag(rules, expr, compress=False)
+def _sorted_arguments(arguments):
+    """Return the unique arguments sorted by number and part."""
+    return tuple(sorted(set(arguments), key=lambda x: (x.number(), x.part())))
+
+
+def _check_integrand_arity(expr, arguments, rules, complex_mode):
+    """Check the arity of an integrand using the given sorted arguments and ArityChecker."""
+    if any(isinstance(t, Argument) for t in traverse_unique_terminals(expr)):
+        arg_tuples = map_expr_dag(rules, expr, compress=False)
+    else:
+        # Integrands without arguments (e.g. functionals) have empty
+        # arity, skip the full walk with the arity checker
+        arg_tuples = ()
     args = tuple(a[0] for a in arg_tuples)
     if args != arguments:
         raise ArityMismatch(f"Integrand arguments {args} differ from form arguments {arguments}.")
@@ -192,7 +200,17 @@ def check_integrand_arity(expr, arguments, complex_mode=False):
                 raise ArityMismatch(f"Argument {arg} is spuriously conjugated in complex Form")
 
 
+def check_integrand_arity(expr, arguments, complex_mode=False):
+    """Check the arity of an integrand."""
+    arguments = _sorted_arguments(arguments)
+    rules = ArityChecker(arguments)
+    _check_integrand_arity(expr, arguments, rules, complex_mode)
+
+
 def check_form_arity(form, arguments, complex_mode=False):
     """Check the arity of a form."""
+    # Build the handler table once and share it between all integrals
+    arguments = _sorted_arguments(arguments)
+    rules = ArityChecker(arguments)
     for itg in form.integrals():
-        check_integrand_arity(itg.integrand(), arguments, complex_mode)
+        _check_integrand_arity(itg.integrand(), arguments, rules, complex_mode)
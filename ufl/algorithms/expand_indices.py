@@ -11,12 +11,15 @@ These utilities are for expanding free indices in expressions to explicit fixed
 #
 # Modified by Anders Logg, 2009.
 
+from inspect import isgeneratorfunction
+
 from ufl.algorithms.transformer import ReuseTransformer, apply_transformer
-from ufl.classes import Terminal
+from ufl.classes import ListTensor, Terminal
 from ufl.constantvalue import Zero
-from ufl.core.multiindex import FixedIndex, Index, MultiIndex
+from ufl.core.multiindex import FixedIndex, MultiIndex
 from ufl.differentiation import Grad
-from ufl.utils.stacks import Stack, StackDict
+from ufl.utils.sequences import balanced_sum
+from ufl.utils.stacks import StackDict
 
 
 class IndexExpander(ReuseTransformer):
@@ -25,14 +28,79 @@ class IndexExpander(ReuseTransformer):
     def __init__(self):
         """Initialise."""
         ReuseTransformer.__init__(self)
-        self._components = Stack()
+        # Stack of component tuples, a plain list for fast append/pop
+        self._components = []
+        # Values of the indices currently being expanded, keyed by
+        # index count to match ufl_free_indices
         self._index2value = StackDict()
+        # Cache of expanded operators, keyed by the expression, the
+        # current component and the values of its free indices
+        self._cache = {}
+        # Typecode:bool, whether the handler expands its own operands
+        # by yielding them
+        self._is_generator = [isgeneratorfunction(h) for h, post in self._handlers]
+
+    def visit(self, o):
+        """Expand o, reusing the results for operators expanded in the same state before.
+
+        Handlers that need expanded operands are generators, which
+        yield each operand to expand and are sent back its expansion.
+        This lets the handlers be driven from an explicit stack instead
+        of recursing on the Python call stack.
+        """
+        start = self._start
+        cache = self._cache
+        stack = []
+        r = start(o, stack)
+        while stack:
+            handler, key = stack[-1]
+            try:
+                # A None result starts the handler on top of the stack
+                op = handler.send(r)
+            except StopIteration as e:
+                stack.pop()
+                r = e.value
+                cache[key] = r
+            else:
+                r = start(op, stack)
+        return r
+
+    def _start(self, o, stack):
+        """Expand o, or push its handler onto stack and return None."""
+        h, post = self._handlers[o._ufl_typecode_]
+        if o._ufl_is_terminal_:
+            return h(o)
+
+        fi = o.ufl_free_indices
+        if fi:
+            index2value = self._index2value
+            values = tuple(index2value.get(i) for i in fi)
+        else:
+            values = ()
+        components = self._components
+        key = (o, components[-1] if components else (), values)
+        r = self._cache.get(key)
+        if r is None:
+            if post:
+                stack.append((self._expand_operands(o, h), key))
+            elif self._is_generator[o._ufl_typecode_]:
+                stack.append((h(o), key))
+            else:
+                r = h(o)
+                self._cache[key] = r
+        return r
+
+    def _expand_operands(self, o, h):
+        """Expand the operands of o and apply the post handler h to them."""
+        ops = []
+        for op in o.ufl_operands:
+            ops.append((yield op))
+        return h(o, *ops)
 
     def component(self):
         """Return current component tuple."""
-        if self._components:
-            return self._components.peek()
-        return ()
+        components = self._components
+        return components[-1] if components else ()
 
     def terminal(self, x):
         """Apply to terminal."""
@@ -70,7 +138,7 @@ class IndexExpander(ReuseTransformer):
         if len(x.ufl_shape) != len(self.component()):
             raise ValueError("Component size mismatch.")
 
-        s = set(x.ufl_free_indices) - set(i.count() for i in self._index2value.keys())
+        s = set(x.ufl_free_indices) - self._index2value.keys()
         if s:
             raise ValueError(f"Free index set mismatch, these indices have no value assigned: {s}.")
 
@@ -79,12 +147,10 @@ class IndexExpander(ReuseTransformer):
 
     def scalar_value(self, x):
         """Apply to scalar_value."""
-        if len(x.ufl_shape) != len(self.component()):
-            self.print_visit_stack()
         if len(x.ufl_shape) != len(self.component()):
             raise ValueError("Component size mismatch.")
 
-        s = set(x.ufl_free_indices) - set(i.count() for i in self._index2value.keys())
+        s = set(x.ufl_free_indices) - self._index2value.keys()
         if s:
             raise ValueError(f"Free index set mismatch, these indices have no value assigned: {s}.")
 
@@ -99,13 +165,13 @@ class IndexExpander(ReuseTransformer):
             raise ValueError("Not expecting tensor in condition.")
 
         # Conditional may be indexed, push empty component
-        self._components.push(())
-        c = self.visit(c)
+        self._components.append(())
+        c = yield c
         self._components.pop()
 
         # Keep possibly non-scalar components for values
-        t = self.visit(t)
-        f = self.visit(f)
+        t = yield t
+        f = yield f
 
         return self.reuse_if_possible(x, c, t, f)
 
@@ -121,17 +187,16 @@ class IndexExpander(ReuseTransformer):
 
         if b.ufl_shape != ():
             raise ValueError("Not expecting division by tensor.")
-        a = self.visit(a)
+        a = yield a
 
-        # self._components.push(())
-        b = self.visit(b)
+        # self._components.append(())
+        b = yield b
         # self._components.pop()
 
         return self.reuse_if_possible(x, a, b)
 
     def index_sum(self, x):
         """Apply to index_sum."""
-        ops = []
         summand, multiindex = x.ufl_operands
         index, = multiindex
 
@@ -139,21 +204,22 @@ class IndexExpander(ReuseTransformer):
         # if index not in self._to_expand:
         #     return self.expr(x, *[self.visit(o) for o in x.ufl_operands])
 
+        # Collect the nonzero expanded terms and add them pairwise
+        terms = []
         for value in range(x.dimension()):
-            self._index2value.push(index, value)
-            ops.append(self.visit(summand))
+            self._index2value.push(index.count(), value)
+            term = yield summand
             self._index2value.pop()
-        return sum(ops)
+            if not isinstance(term, Zero):
+                terms.append(term)
+        if not terms:
+            return Zero()
+        return balanced_sum(terms)
 
     def _multi_index_values(self, x):
         """Apply to _multi_index_values."""
-        comp = []
-        for i in x._indices:
-            if isinstance(i, FixedIndex):
-                comp.append(i._value)
-            elif isinstance(i, Index):
-                comp.append(self._index2value[i])
-        return tuple(comp)
+        index2value = self._index2value
+        return tuple(i._value if isinstance(i, FixedIndex) else index2value[i.count()] for i in x._indices)
 
     def multi_index(self, x):
         """Apply to multi_index."""
@@ -165,14 +231,14 @@ class IndexExpander(ReuseTransformer):
         A, ii = x.ufl_operands
 
         # Push new component built from index value map
-        self._components.push(self._multi_index_values(ii))
+        self._components.append(self._multi_index_values(ii))
 
         # Hide index values (doing this is not correct behaviour)
         # for i in ii:
         #     if isinstance(i, Index):
         #         self._index2value.push(i, None)
 
-        result = self.visit(A)
+        result = yield A
 
         # Un-hide index values
         # for i in ii:
@@ -196,11 +262,11 @@ class IndexExpander(ReuseTransformer):
         if len(indices) != len(comp):
             raise ValueError("Index/component mismatch.")
         for i, v in zip(indices.indices(), comp):
-            self._index2value.push(i, v)
-        self._components.push(())
+            self._index2value.push(i.count(), v)
+        self._components.append(())
 
         # Evaluate with these indices
-        result = self.visit(expression)
+        result = yield expression
 
         # Revert index map
         for _ in comp:
@@ -210,13 +276,18 @@ class IndexExpander(ReuseTransformer):
 
     def list_tensor(self, x):
         """Apply to list_tensor."""
-        # Pick the right subtensor and subcomponent
+        # Pick the right subtensor and subcomponent, descending
+        # directly through any nested list tensors
         c = self.component()
-        c0, c1 = c[0], c[1:]
-        op = x.ufl_operands[c0]
+        if len(c) < len(x.ufl_shape):
+            raise ValueError("Component size mismatch.")
+        op = x
+        while c and isinstance(op, ListTensor):
+            op = op.ufl_operands[c[0]]
+            c = c[1:]
         # Evaluate subtensor with this subcomponent
-        self._components.push(c1)
-        r = self.visit(op)
+        self._components.append(c)
+        r = yield op
         self._components.pop()
         return r
 
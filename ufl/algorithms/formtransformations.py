@@ -23,20 +23,14 @@ from ufl.coefficient import Coefficient
 from ufl.constantvalue import Zero
 # All classes:
 from ufl.core.expr import ufl_err_str
+from ufl.corealg.traversal import traverse_unique_terminals
 
 
 # FIXME: Don't use this below, it makes partextracter more expensive than necessary
 def _expr_has_terminal_types(expr, ufl_types):
     """Check if an expression has terminal types."""
-    input = [expr]
-    while input:
-        e = input.pop()
-        ops = e.ufl_operands
-        if ops:
-            input.extend(ops)
-        elif isinstance(e, ufl_types):
-            return True
-    return False
+    # Visit shared subexpressions only once
+    return any(isinstance(t, ufl_types) for t in traverse_unique_terminals(expr))
 
 
 def zero_expr(e):
@@ -134,10 +128,7 @@ class PartExtracter(Transformer):
 
             # Add the contributions from this part to temporary list
             term_provides = frozenset(term_provides)
-            if term_provides in parts_that_provide:
-                parts_that_provide[term_provides] += [part]
-            else:
-                parts_that_provide[term_provides] = [part]
+            parts_that_provide.setdefault(term_provides, []).append(part)
 
         # 2. If there are no remaining terms, return zero
         if not parts_that_provide:
@@ -179,7 +170,7 @@ class PartExtracter(Transformer):
 
             # Add factor to factors and extend provides
             factors.append(factor)
-            provides = provides | factor_provides
+            provides |= factor_provides
 
             # If we provide more than we want, return zero
             if provides - self._want:
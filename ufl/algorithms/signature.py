@@ -8,34 +8,70 @@
 import hashlib
 
 from ufl.algorithms.domain_analysis import canonicalize_metadata
-from ufl.classes import (Argument, Coefficient, Constant, ConstantValue, ExprList, ExprMapping, GeometricQuantity,
-                         Index, Label, MultiIndex)
+from ufl.classes import (Argument, Coefficient, Constant, ConstantValue, Expr, ExprList, ExprMapping, FixedIndex,
+                         GeometricQuantity, Label, MultiIndex)
 from ufl.corealg.traversal import traverse_unique_terminals, unique_post_traversal
 
 
 def compute_multiindex_hashdata(expr, index_numbering):
     """Compute multiindex hashdata."""
     data = []
-    for i in expr:
-        if isinstance(i, Index):
+    for i in expr.indices():
+        if type(i) is FixedIndex:
+            # Use nonnegative ints for FixedIndex
+            data.append(i._value)
+        else:
             j = index_numbering.get(i)
             if j is None:
                 # Use negative ints for Index
                 j = -(len(index_numbering) + 1)
                 index_numbering[i] = j
             data.append(j)
-        else:
-            # Use nonnegative ints for FixedIndex
-            data.append(int(i))
     return tuple(data)
 
 
+# Kinds of terminal hashdata, see _terminal_hashdata_kinds
+_MULTIINDEX_HASHDATA = 0
+_SIGNATURE_HASHDATA = 1
+
+# Cache of the typecode indexed table built by _terminal_hashdata_kinds
+_terminal_hashdata_kinds_table = []
+
+
+def _terminal_hashdata_kind(cls):
+    """Return how to compute hashdata for terminals of class cls, or None if unsupported."""
+    if issubclass(cls, MultiIndex):
+        return _MULTIINDEX_HASHDATA
+    elif issubclass(cls, (ConstantValue, Coefficient, Constant, Argument, GeometricQuantity, Label)):
+        return _SIGNATURE_HASHDATA
+    elif issubclass(cls, ExprList):
+        # Not really a terminal but can have 0 operands...
+        return "[]"
+    elif issubclass(cls, ExprMapping):
+        # Not really a terminal but can have 0 operands...
+        return "{}"
+    return None
+
+
+def _terminal_hashdata_kinds():
+    """Return a list mapping each typecode to its kind of terminal hashdata."""
+    table = _terminal_hashdata_kinds_table
+    classes = Expr._ufl_all_classes_
+    if len(table) != len(classes):
+        # Rebuild if UFL types have been added since the last call
+        table[:] = [_terminal_hashdata_kind(c) for c in classes]
+    return table
+
+
 def compute_terminal_hashdata(expressions, renumbering):
     """Compute terminal hashdata."""
     if not isinstance(expressions, list):
         expressions = [expressions]
     assert renumbering is not None
 
+    # Typecode based dispatch instead of a chain of isinstance checks
+    kinds = _terminal_hashdata_kinds()
+
     # Extract a unique numbering of free indices, as well as form
     # arguments, and just take repr of the rest of the terminals while
     # we're iterating over them
@@ -43,40 +79,21 @@ def compute_terminal_hashdata(expressions, renumbering):
     index_numbering = {}
     for expression in expressions:
         for expr in traverse_unique_terminals(expression):
+            kind = kinds[expr._ufl_typecode_]
 
-            if isinstance(expr, MultiIndex):
+            if kind == _SIGNATURE_HASHDATA:
+                data = expr._ufl_signature_data_(renumbering)
+
+            elif kind == _MULTIINDEX_HASHDATA:
                 # Indices need a canonical numbering for a stable
                 # signature, thus this algorithm
                 data = compute_multiindex_hashdata(expr, index_numbering)
 
-            elif isinstance(expr, ConstantValue):
-                data = expr._ufl_signature_data_(renumbering)
-
-            elif isinstance(expr, Coefficient):
-                data = expr._ufl_signature_data_(renumbering)
-
-            elif isinstance(expr, Constant):
-                data = expr._ufl_signature_data_(renumbering)
-
-            elif isinstance(expr, Argument):
-                data = expr._ufl_signature_data_(renumbering)
-
-            elif isinstance(expr, GeometricQuantity):
-                data = expr._ufl_signature_data_(renumbering)
-
-            elif isinstance(expr, Label):
-                data = expr._ufl_signature_data_(renumbering)
-
-            elif isinstance(expr, ExprList):
-                # Not really a terminal but can have 0 operands...
-                data = "[]"
-
-            elif isinstance(expr, ExprMapping):
-                # Not really a terminal but can have 0 operands...
-                data = "{}"
+            elif kind is None:
+                raise ValueError(f"Unknown terminal type {type(expr)}")
 
             else:
-                raise ValueError(f"Unknown terminal type {type(expr)}")
+                data = kind
 
             terminal_hashdata[expr] = data
 
@@ -229,6 +229,15 @@ class VariableStripper(ReuseTransformer):
     def __init__(self):
         """Initialise."""
         ReuseTransformer.__init__(self)
+        self._cache = {}
+
+    def visit(self, o):
+        """Visit, reusing the result if o has been stripped before."""
+        r = self._cache.get(o)
+        if r is None:
+            r = ReuseTransformer.visit(self, o)
+            self._cache[o] = r
+        return r
 
     def variable(self, o):
         """Visit a variable."""
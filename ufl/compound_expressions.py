@@ -8,11 +8,14 @@
 # Modified by Anders Logg, 2009-2010
 
 import warnings
+from itertools import combinations
 
-from ufl.constantvalue import Zero, zero
+from ufl.constantvalue import Identity, IntValue, Zero, zero
 from ufl.core.multiindex import Index, indices
+from ufl.index_combination_utils import merge_nonoverlapping_indices
 from ufl.operators import sqrt
 from ufl.tensors import as_matrix, as_tensor, as_vector
+from ufl.utils.sequences import balanced_sum
 
 # Note: To avoid typing errors, the expressions for cofactor and
 # deviatoric parts below were created with the script
@@ -28,17 +31,29 @@ def cross_expr(a, b):
     """Symbolic cross product."""
     assert len(a) == 3
     assert len(b) == 3
+    if isinstance(a, Zero) or isinstance(b, Zero):
+        fi, fid = merge_nonoverlapping_indices(a, b)
+        return Zero((3,), fi, fid)
 
     def c(i, j):
         return a[i] * b[j] - a[j] * b[i]
     return as_vector((c(1, 2), c(2, 0), c(0, 1)))
 
 
+def _ata_expr(A):
+    """Compute A.T*A.
+
+    The entries are written out with fixed indices, so the A.T*A built
+    for the pseudo-determinant and the pseudo-inverse of the same A are
+    equal expressions and are shared by the DAG based algorithms.
+    """
+    m, n = A.ufl_shape
+    return as_matrix([[sum(A[k, i] * A[k, j] for k in range(m)) for j in range(n)] for i in range(n)])
+
+
 def generic_pseudo_determinant_expr(A):
     """Compute the pseudo-determinant of A: sqrt(det(A.T*A))."""
-    i, j, k = indices(3)
-    ATA = as_tensor(A[k, i] * A[k, j], (i, j))
-    return sqrt(determinant_expr(ATA))
+    return sqrt(determinant_expr(_ata_expr(A)))
 
 
 def pseudo_determinant_expr(A):
@@ -60,9 +75,7 @@ def pseudo_determinant_expr(A):
 
 def generic_pseudo_inverse_expr(A):
     """Compute the Penrose-Moore pseudo-inverse of A: (A.T*A)^-1 * A.T."""
-    i, j, k = indices(3)
-    ATA = as_tensor(A[k, i] * A[k, j], (i, j))
-    ATAinv = inverse_expr(ATA)
+    ATAinv = inverse_expr(_ata_expr(A))
     q, r, s = indices(3)
     return as_tensor(ATAinv[r, q] * A[s, q], (r, s))
 
@@ -84,6 +97,8 @@ def determinant_expr(A):
     sh = A.ufl_shape
     if isinstance(A, Zero):
         return zero()
+    elif isinstance(A, Identity):
+        return IntValue(1)
     elif sh == ():
         return A
     elif sh[0] == sh[1]:
@@ -107,6 +122,12 @@ def _det_2x2(B, i, j, k, l):  # noqa: E741
     return B[i, k] * B[j, l] - B[i, l] * B[j, k]
 
 
+def _entries(A):
+    """Entries A[i, j] of a square matrix as nested tuples, each indexed once."""
+    n = A.ufl_shape[0]
+    return tuple(tuple(A[i, j] for j in range(n)) for i in range(n))
+
+
 def determinant_expr_2x2(B):
     """Determinant of a 2 by 2 matrix."""
     return _det_2x2(B, 0, 1, 0, 1)
@@ -133,14 +154,22 @@ def determinant_expr_nxn(A):
 
 def codeterminant_expr_nxn(A, rows, cols):
     """Determinant of a n by n matrix."""
+    return _codeterminant_expr_nxn(A, tuple(rows), tuple(cols), {})
+
+
+def _codeterminant_expr_nxn(A, rows, cols, minors):
+    """Determinant of a n by n matrix, reusing the minors already built."""
+    codet = minors.get((rows, cols))
+    if codet is not None:
+        return codet
     if len(rows) == 2:
-        return _det_2x2(A, rows[0], rows[1], cols[0], cols[1])
-    codet = 0.0
-    r = rows[0]
-    subrows = rows[1:]
-    for i, c in enumerate(cols):
-        subcols = cols[:i] + cols[i + 1:]
-        codet += (-1)**i * A[r, c] * codeterminant_expr_nxn(A, subrows, subcols)
+        codet = _det_2x2(A, rows[0], rows[1], cols[0], cols[1])
+    else:
+        r = rows[0]
+        subrows = rows[1:]
+        codet = balanced_sum((-1)**i * A[r, c] * _codeterminant_expr_nxn(A, subrows, cols[:i] + cols[i + 1:], minors)
+                             for i, c in enumerate(cols))
+    minors[(rows, cols)] = codet
     return codet
 
 
@@ -182,44 +211,26 @@ def adj_expr_2x2(A):
 
 def adj_expr_3x3(A):
     """Adjoint of a 3 by 3 matrix."""
+    (a00, a01, a02), (a10, a11, a12), (a20, a21, a22) = _entries(A)
     return as_matrix([[
-        A[2, 2] * A[1, 1] - A[1, 2] * A[2, 1],
-        -A[0, 1] * A[2, 2] + A[0, 2] * A[2, 1],
-        A[0, 1] * A[1, 2] - A[0, 2] * A[1, 1],
+        a22 * a11 - a12 * a21,
+        -a01 * a22 + a02 * a21,
+        a01 * a12 - a02 * a11,
     ], [
-        -A[2, 2] * A[1, 0] + A[1, 2] * A[2, 0],
-        -A[0, 2] * A[2, 0] + A[2, 2] * A[0, 0],
-        A[0, 2] * A[1, 0] - A[1, 2] * A[0, 0],
+        -a22 * a10 + a12 * a20,
+        -a02 * a20 + a22 * a00,
+        a02 * a10 - a12 * a00,
     ], [
-        A[1, 0] * A[2, 1] - A[2, 0] * A[1, 1],
-        A[0, 1] * A[2, 0] - A[0, 0] * A[2, 1],
-        A[0, 0] * A[1, 1] - A[0, 1] * A[1, 0],
+        a10 * a21 - a20 * a11,
+        a01 * a20 - a00 * a21,
+        a00 * a11 - a01 * a10,
     ]])
 
 
 def adj_expr_4x4(A):
     """Adjoint of a 4 by 4 matrix."""
-    return as_matrix([[
-        -A[3, 3] * A[2, 1] * A[1, 2] + A[1, 2] * A[3, 1] * A[2, 3] + A[1, 1] * A[3, 3] * A[2, 2] - A[3, 1] * A[2, 2] * A[1, 3] + A[2, 1] * A[1, 3] * A[3, 2] - A[1, 1] * A[3, 2] * A[2, 3],  # noqa: E501
-        -A[3, 1] * A[0, 2] * A[2, 3] + A[0, 1] * A[3, 2] * A[2, 3] - A[0, 3] * A[2, 1] * A[3, 2] + A[3, 3] * A[2, 1] * A[0, 2] - A[3, 3] * A[0, 1] * A[2, 2] + A[0, 3] * A[3, 1] * A[2, 2],  # noqa: E501
-        A[3, 1] * A[1, 3] * A[0, 2] + A[1, 1] * A[0, 3] * A[3, 2] - A[0, 3] * A[1, 2] * A[3, 1] - A[0, 1] * A[1, 3] * A[3, 2] + A[3, 3] * A[1, 2] * A[0, 1] - A[1, 1] * A[3, 3] * A[0, 2],  # noqa: E501
-        A[1, 1] * A[0, 2] * A[2, 3] - A[2, 1] * A[1, 3] * A[0, 2] + A[0, 3] * A[2, 1] * A[1, 2] - A[1, 2] * A[0, 1] * A[2, 3] - A[1, 1] * A[0, 3] * A[2, 2] + A[0, 1] * A[2, 2] * A[1, 3],  # noqa: E501
-    ], [
-        A[3, 3] * A[1, 2] * A[2, 0] - A[3, 0] * A[1, 2] * A[2, 3] + A[1, 0] * A[3, 2] * A[2, 3] - A[3, 3] * A[1, 0] * A[2, 2] - A[1, 3] * A[3, 2] * A[2, 0] + A[3, 0] * A[2, 2] * A[1, 3],  # noqa: E501
-        A[0, 3] * A[3, 2] * A[2, 0] - A[0, 3] * A[3, 0] * A[2, 2] + A[3, 3] * A[0, 0] * A[2, 2] + A[3, 0] * A[0, 2] * A[2, 3] - A[0, 0] * A[3, 2] * A[2, 3] - A[3, 3] * A[0, 2] * A[2, 0],  # noqa: E501
-        -A[3, 3] * A[0, 0] * A[1, 2] + A[0, 0] * A[1, 3] * A[3, 2] - A[3, 0] * A[1, 3] * A[0, 2] + A[3, 3] * A[1, 0] * A[0, 2] + A[0, 3] * A[3, 0] * A[1, 2] - A[0, 3] * A[1, 0] * A[3, 2],  # noqa: E501
-        A[0, 3] * A[1, 0] * A[2, 2] + A[1, 3] * A[0, 2] * A[2, 0] - A[0, 0] * A[2, 2] * A[1, 3] - A[0, 3] * A[1, 2] * A[2, 0] + A[0, 0] * A[1, 2] * A[2, 3] - A[1, 0] * A[0, 2] * A[2, 3],  # noqa: E501
-    ], [
-        A[3, 1] * A[1, 3] * A[2, 0] + A[3, 3] * A[2, 1] * A[1, 0] + A[1, 1] * A[3, 0] * A[2, 3] - A[1, 0] * A[3, 1] * A[2, 3] - A[3, 0] * A[2, 1] * A[1, 3] - A[1, 1] * A[3, 3] * A[2, 0],  # noqa: E501
-        A[3, 3] * A[0, 1] * A[2, 0] - A[3, 3] * A[0, 0] * A[2, 1] - A[0, 3] * A[3, 1] * A[2, 0] - A[3, 0] * A[0, 1] * A[2, 3] + A[0, 0] * A[3, 1] * A[2, 3] + A[0, 3] * A[3, 0] * A[2, 1],  # noqa: E501
-        -A[0, 0] * A[3, 1] * A[1, 3] + A[0, 3] * A[1, 0] * A[3, 1] - A[3, 3] * A[1, 0] * A[0, 1] + A[1, 1] * A[3, 3] * A[0, 0] - A[1, 1] * A[0, 3] * A[3, 0] + A[3, 0] * A[0, 1] * A[1, 3],  # noqa: E501
-        A[0, 0] * A[2, 1] * A[1, 3] + A[1, 0] * A[0, 1] * A[2, 3] - A[0, 3] * A[2, 1] * A[1, 0] + A[1, 1] * A[0, 3] * A[2, 0] - A[1, 1] * A[0, 0] * A[2, 3] - A[0, 1] * A[1, 3] * A[2, 0],  # noqa: E501
-    ], [
-        -A[1, 2] * A[3, 1] * A[2, 0] - A[2, 1] * A[1, 0] * A[3, 2] + A[3, 0] * A[2, 1] * A[1, 2] - A[1, 1] * A[3, 0] * A[2, 2] + A[1, 0] * A[3, 1] * A[2, 2] + A[1, 1] * A[3, 2] * A[2, 0],  # noqa: E501
-        -A[3, 0] * A[2, 1] * A[0, 2] - A[0, 1] * A[3, 2] * A[2, 0] + A[3, 1] * A[0, 2] * A[2, 0] - A[0, 0] * A[3, 1] * A[2, 2] + A[3, 0] * A[0, 1] * A[2, 2] + A[0, 0] * A[2, 1] * A[3, 2],  # noqa: E501
-        A[0, 0] * A[1, 2] * A[3, 1] - A[1, 0] * A[3, 1] * A[0, 2] + A[1, 1] * A[3, 0] * A[0, 2] + A[1, 0] * A[0, 1] * A[3, 2] - A[3, 0] * A[1, 2] * A[0, 1] - A[1, 1] * A[0, 0] * A[3, 2],  # noqa: E501
-        -A[1, 1] * A[0, 2] * A[2, 0] + A[2, 1] * A[1, 0] * A[0, 2] + A[1, 2] * A[0, 1] * A[2, 0] + A[1, 1] * A[0, 0] * A[2, 2] - A[1, 0] * A[0, 1] * A[2, 2] - A[0, 0] * A[2, 1] * A[1, 2],  # noqa: E501
-    ]])
+    cofactors = _cofactors_4x4(A)
+    return as_matrix([[cofactors[j][i] for j in range(4)] for i in range(4)])
 
 
 def cofactor_expr(A):
@@ -246,44 +257,54 @@ def cofactor_expr_2x2(A):
 
 def cofactor_expr_3x3(A):
     """Cofactor of a 3 by 3 matrix."""
+    (a00, a01, a02), (a10, a11, a12), (a20, a21, a22) = _entries(A)
     return as_matrix([[
-        A[1, 1] * A[2, 2] - A[2, 1] * A[1, 2],
-        A[2, 0] * A[1, 2] - A[1, 0] * A[2, 2],
-        -A[2, 0] * A[1, 1] + A[1, 0] * A[2, 1],
+        a11 * a22 - a21 * a12,
+        a20 * a12 - a10 * a22,
+        -a20 * a11 + a10 * a21,
     ], [
-        A[2, 1] * A[0, 2] - A[0, 1] * A[2, 2],
-        A[0, 0] * A[2, 2] - A[2, 0] * A[0, 2],
-        -A[0, 0] * A[2, 1] + A[2, 0] * A[0, 1],
+        a21 * a02 - a01 * a22,
+        a00 * a22 - a20 * a02,
+        -a00 * a21 + a20 * a01,
     ], [
-        A[0, 1] * A[1, 2] - A[1, 1] * A[0, 2],
-        A[1, 0] * A[0, 2] - A[0, 0] * A[1, 2],
-        -A[1, 0] * A[0, 1] + A[0, 0] * A[1, 1],
+        a01 * a12 - a11 * a02,
+        a10 * a02 - a00 * a12,
+        -a10 * a01 + a00 * a11,
     ]])
 
 
 def cofactor_expr_4x4(A):
     """Cofactor of a 4 by 4 matrix."""
-    return as_matrix([[
-        -A[3, 1] * A[2, 2] * A[1, 3] - A[3, 2] * A[2, 3] * A[1, 1] + A[1, 3] * A[3, 2] * A[2, 1] + A[3, 1] * A[2, 3] * A[1, 2] + A[2, 2] * A[1, 1] * A[3, 3] - A[3, 3] * A[2, 1] * A[1, 2],  # noqa: E501
-        -A[1, 0] * A[2, 2] * A[3, 3] + A[2, 0] * A[3, 3] * A[1, 2] + A[2, 2] * A[1, 3] * A[3, 0] - A[2, 3] * A[3, 0] * A[1, 2] + A[1, 0] * A[3, 2] * A[2, 3] - A[1, 3] * A[3, 2] * A[2, 0],  # noqa: E501
-        A[1, 0] * A[3, 3] * A[2, 1] + A[2, 3] * A[1, 1] * A[3, 0] - A[2, 0] * A[1, 1] * A[3, 3] - A[1, 3] * A[3, 0] * A[2, 1] - A[1, 0] * A[3, 1] * A[2, 3] + A[3, 1] * A[1, 3] * A[2, 0],  # noqa: E501
-        A[3, 0] * A[2, 1] * A[1, 2] + A[1, 0] * A[3, 1] * A[2, 2] + A[3, 2] * A[2, 0] * A[1, 1] - A[2, 2] * A[1, 1] * A[3, 0] - A[3, 1] * A[2, 0] * A[1, 2] - A[1, 0] * A[3, 2] * A[2, 1],  # noqa: E501
-    ], [
-        A[3, 1] * A[2, 2] * A[0, 3] + A[0, 2] * A[3, 3] * A[2, 1] + A[0, 1] * A[3, 2] * A[2, 3] - A[3, 1] * A[0, 2] * A[2, 3] - A[0, 1] * A[2, 2] * A[3, 3] - A[3, 2] * A[0, 3] * A[2, 1],  # noqa: E501
-        -A[2, 2] * A[0, 3] * A[3, 0] - A[0, 2] * A[2, 0] * A[3, 3] - A[3, 2] * A[2, 3] * A[0, 0] + A[2, 2] * A[3, 3] * A[0, 0] + A[0, 2] * A[2, 3] * A[3, 0] + A[3, 2] * A[2, 0] * A[0, 3],  # noqa: E501
-        A[3, 1] * A[2, 3] * A[0, 0] - A[0, 1] * A[2, 3] * A[3, 0] - A[3, 1] * A[2, 0] * A[0, 3] - A[3, 3] * A[0, 0] * A[2, 1] + A[0, 3] * A[3, 0] * A[2, 1] + A[0, 1] * A[2, 0] * A[3, 3],  # noqa: E501
-        A[3, 2] * A[0, 0] * A[2, 1] - A[0, 2] * A[3, 0] * A[2, 1] + A[0, 1] * A[2, 2] * A[3, 0] + A[3, 1] * A[0, 2] * A[2, 0] - A[0, 1] * A[3, 2] * A[2, 0] - A[3, 1] * A[2, 2] * A[0, 0],  # noqa: E501
-    ], [
-        A[3, 1] * A[1, 3] * A[0, 2] - A[0, 2] * A[1, 1] * A[3, 3] - A[3, 1] * A[0, 3] * A[1, 2] + A[3, 2] * A[1, 1] * A[0, 3] + A[0, 1] * A[3, 3] * A[1, 2] - A[0, 1] * A[1, 3] * A[3, 2],  # noqa: E501
-        A[1, 3] * A[3, 2] * A[0, 0] - A[1, 0] * A[3, 2] * A[0, 3] - A[1, 3] * A[0, 2] * A[3, 0] + A[0, 3] * A[3, 0] * A[1, 2] + A[1, 0] * A[0, 2] * A[3, 3] - A[3, 3] * A[0, 0] * A[1, 2],  # noqa: E501
-        -A[1, 0] * A[0, 1] * A[3, 3] + A[0, 1] * A[1, 3] * A[3, 0] - A[3, 1] * A[1, 3] * A[0, 0] - A[1, 1] * A[0, 3] * A[3, 0] + A[1, 0] * A[3, 1] * A[0, 3] + A[1, 1] * A[3, 3] * A[0, 0],  # noqa: E501
-        A[0, 2] * A[1, 1] * A[3, 0] - A[3, 2] * A[1, 1] * A[0, 0] - A[0, 1] * A[3, 0] * A[1, 2] - A[1, 0] * A[3, 1] * A[0, 2] + A[3, 1] * A[0, 0] * A[1, 2] + A[1, 0] * A[0, 1] * A[3, 2],  # noqa: E501
-    ], [
-        A[0, 3] * A[2, 1] * A[1, 2] + A[0, 2] * A[2, 3] * A[1, 1] + A[0, 1] * A[2, 2] * A[1, 3] - A[2, 2] * A[1, 1] * A[0, 3] - A[1, 3] * A[0, 2] * A[2, 1] - A[0, 1] * A[2, 3] * A[1, 2],  # noqa: E501
-        A[1, 0] * A[2, 2] * A[0, 3] + A[1, 3] * A[0, 2] * A[2, 0] - A[1, 0] * A[0, 2] * A[2, 3] - A[2, 0] * A[0, 3] * A[1, 2] - A[2, 2] * A[1, 3] * A[0, 0] + A[2, 3] * A[0, 0] * A[1, 2],  # noqa: E501
-        -A[0, 1] * A[1, 3] * A[2, 0] + A[2, 0] * A[1, 1] * A[0, 3] + A[1, 3] * A[0, 0] * A[2, 1] - A[1, 0] * A[0, 3] * A[2, 1] + A[1, 0] * A[0, 1] * A[2, 3] - A[2, 3] * A[1, 1] * A[0, 0],  # noqa: E501
-        A[1, 0] * A[0, 2] * A[2, 1] - A[0, 2] * A[2, 0] * A[1, 1] + A[0, 1] * A[2, 0] * A[1, 2] + A[2, 2] * A[1, 1] * A[0, 0] - A[1, 0] * A[0, 1] * A[2, 2] - A[0, 0] * A[2, 1] * A[1, 2],  # noqa: E501
-    ]])
+    return as_matrix(_cofactors_4x4(A))
+
+
+def _cofactors_4x4(A):
+    """Cofactors of a 4 by 4 matrix as nested lists.
+
+    Each 3 by 3 minor is expanded along the row paired with the removed
+    row, (0, 1) or (2, 3), in terms of the 2 by 2 minors of the other
+    pair of rows. Only these twelve 2 by 2 minors are built, and they
+    are shared between all the cofactors.
+    """
+    a = _entries(A)
+    minors = {}
+    for r0, r1 in ((0, 1), (2, 3)):
+        for c0, c1 in combinations(range(4), 2):
+            minors[r0, c0, c1] = a[r0][c0] * a[r1][c1] - a[r0][c1] * a[r1][c0]
+
+    cofactors = []
+    for i in range(4):
+        p = i ^ 1
+        r0 = 2 if i < 2 else 0
+        row = []
+        for j in range(4):
+            c0, c1, c2 = (c for c in range(4) if c != j)
+            codet = (a[p][c0] * minors[r0, c1, c2]
+                     - a[p][c1] * minors[r0, c0, c2]
+                     + a[p][c2] * minors[r0, c0, c1])
+            row.append(codet if (i + j) % 2 == 0 else -codet)
+        cofactors.append(row)
+    return cofactors
 
 
 def deviatoric_expr(A):
@@ -308,6 +329,7 @@ def deviatoric_expr_2x2(A):
 
 def deviatoric_expr_3x3(A):
     """Deviatoric of a 3 by 3 matrix."""
-    return as_matrix([[-1. / 3 * A[1, 1] - 1. / 3 * A[2, 2] + 2. / 3 * A[0, 0], A[0, 1], A[0, 2]],
-                      [A[1, 0], 2. / 3 * A[1, 1] - 1. / 3 * A[2, 2] - 1. / 3 * A[0, 0], A[1, 2]],
-                      [A[2, 0], A[2, 1], -1. / 3 * A[1, 1] + 2. / 3 * A[2, 2] - 1. / 3 * A[0, 0]]])
+    (a00, a01, a02), (a10, a11, a12), (a20, a21, a22) = _entries(A)
+    return as_matrix([[-1. / 3 * a11 - 1. / 3 * a22 + 2. / 3 * a00, a01, a02],
+                      [a10, 2. / 3 * a11 - 1. / 3 * a22 - 1. / 3 * a00, a12],
+                      [a20, a21, -1. / 3 * a11 + 2. / 3 * a22 - 1. / 3 * a00]])
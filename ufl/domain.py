@@ -8,6 +8,7 @@
 
 import numbers
 import warnings
+from itertools import chain
 
 from ufl.cell import AbstractCell
 from ufl.core.ufl_id import attach_ufl_id
@@ -24,10 +25,11 @@ class AbstractDomain(object):
 
     def __init__(self, topological_dimension, geometric_dimension):
         """Initialise."""
-        # Validate dimensions
-        if not isinstance(geometric_dimension, numbers.Integral):
+        # Validate dimensions, checking for a plain int first to avoid
+        # the slower abstract base class check in the common case
+        if type(geometric_dimension) is not int and not isinstance(geometric_dimension, numbers.Integral):
             raise ValueError(f"Expecting integer geometric dimension, not {geometric_dimension.__class__}")
-        if not isinstance(topological_dimension, numbers.Integral):
+        if type(topological_dimension) is not int and not isinstance(topological_dimension, numbers.Integral):
             raise ValueError(f"Expecting integer topological dimension, not {topological_dimension.__class__}")
         if topological_dimension > geometric_dimension:
             raise ValueError("Topological dimension cannot be larger than geometric dimension.")
@@ -201,28 +203,27 @@ def join_domains(domains):
 
     Checks that domains with the same id are compatible.
     """
-    # Use hashing to join domains, ignore None
-    domains = set(domains) - set((None,))
+    # Use hashing to join domains, preserving the initial ordering,
+    # ignore None
+    domains = dict.fromkeys(domains)
+    domains.pop(None, None)
     if not domains:
         return ()
 
-    # Check geometric dimension compatibility
+    # Check geometric dimension compatibility and split into legacy
+    # and modern style domains in a single pass
     gdims = set()
-    for domain in domains:
-        gdims.add(domain.geometric_dimension())
-    if len(gdims) != 1:
-        raise ValueError("Found domains with different geometric dimensions.")
-    gdim, = gdims
-
-    # Split into legacy and modern style domains
     legacy_domains = []
     modern_domains = []
     for domain in domains:
+        gdims.add(domain.geometric_dimension())
         if isinstance(domain, Mesh) and domain.ufl_id() < 0:
             assert domain.ufl_cargo() is None
             legacy_domains.append(domain)
         else:
             modern_domains.append(domain)
+    if len(gdims) != 1:
+        raise ValueError("Found domains with different geometric dimensions.")
 
     # Handle legacy domains checking
     if legacy_domains:
@@ -244,9 +245,7 @@ def join_domains(domains):
 
 def extract_domains(expr):
     """Return all domains expression is defined on."""
-    domainlist = []
-    for t in traverse_unique_terminals(expr):
-        domainlist.extend(t.ufl_domains())
+    domainlist = chain.from_iterable(t.ufl_domains() for t in traverse_unique_terminals(expr))
     return sorted(join_domains(domainlist))
 
 
@@ -265,8 +264,12 @@ def find_geometric_dimension(expr):
     """Find the geometric dimension of an expression."""
     gdims = set()
     for t in traverse_unique_terminals(expr):
-        domain = extract_unique_domain(t)
-        if domain is not None:
+        # Equivalent to extract_unique_domain(t), without starting a
+        # new traversal for each terminal
+        domains = join_domains(t.ufl_domains())
+        if len(domains) > 1:
+            raise ValueError("Found multiple domains, cannot return just one.")
+        for domain in domains:
             gdims.add(domain.geometric_dimension())
         if hasattr(t, "ufl_element"):
             element = t.ufl_element()
@@ -22,6 +22,7 @@ from ufl.pullback import AbstractPullback as _AbstractPullback
 from ufl.pullback import IdentityPullback as _IdentityPullback
 from ufl.pullback import MixedPullback as _MixedPullback
 from ufl.pullback import SymmetricPullback as _SymmetricPullback
+from ufl.pullback import identity_pullback as _identity_pullback
 from ufl.sobolevspace import SobolevSpace as _SobolevSpace
 from ufl.utils.sequences import product
 
@@ -239,10 +240,13 @@ class FiniteElement(AbstractFiniteElement):
 
     def __hash__(self) -> int:
         """Return a hash."""
-        return hash(f"{self!r}")
+        # Hashing the stored repr string reuses its cached string hash
+        return hash(repr(self))
 
     def __eq__(self, other) -> bool:
         """Check if this element is equal to another element."""
+        if self is other:
+            return True
         return type(self) is type(other) and repr(self) == repr(other)
 
     @property
@@ -356,7 +360,7 @@ class MixedElement(FiniteElement):
         degree = max(e.embedded_superdegree for e in sub_elements)
         reference_value_shape = (sum(e.reference_value_size for e in sub_elements), )
         if all(isinstance(e.pullback, _IdentityPullback) for e in sub_elements):
-            pullback = _IdentityPullback()
+            pullback = _identity_pullback
         else:
             pullback = _MixedPullback(self)
         sobolev_space = max(e.sobolev_space for e in sub_elements)
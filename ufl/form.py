@@ -270,8 +270,7 @@ class Form(BaseForm):
         # Internal variables for caching base form operator data
         self._base_form_operators = None
 
-        from ufl.algorithms.analysis import extract_constants
-        self._constants = extract_constants(self)
+        self._constants = None
 
         # Internal variables for caching of hash and signature after
         # first request
@@ -391,6 +390,8 @@ class Form(BaseForm):
 
     def constants(self):
         """Get constants."""
+        if self._constants is None:
+            self._analyze_form_arguments()
         return self._constants
 
     def constant_numbering(self):
@@ -624,21 +625,22 @@ class Form(BaseForm):
         self._subdomain_data = subdomain_data
 
     def _analyze_form_arguments(self):
-        """Analyze which Argument and Coefficient objects can be found in the form."""
-        from ufl.algorithms.analysis import extract_arguments_and_coefficients
-        arguments, coefficients = extract_arguments_and_coefficients(self)
+        """Analyze which Argument, Coefficient and Constant objects can be found in the form."""
+        from ufl.algorithms.analysis import extract_arguments_coefficients_and_constants
+        arguments, coefficients, constants = extract_arguments_coefficients_and_constants(self)
 
         # Define canonical numbering of arguments and coefficients
         self._arguments = tuple(
             sorted(set(arguments), key=lambda x: x.number()))
-        self._coefficients = tuple(
-            sorted(set(coefficients), key=lambda x: x.count()))
+        self._coefficients = tuple(sorted_by_count(set(coefficients)))
+        self._constants = constants
 
     def _analyze_base_form_operators(self):
         """Analyze which BaseFormOperator objects can be found in the form."""
-        from ufl.algorithms.analysis import extract_base_form_operators
-        base_form_ops = extract_base_form_operators(self)
-        self._base_form_operators = tuple(sorted(base_form_ops, key=lambda x: x.count()))
+        from ufl.algorithms.analysis import extract_type
+        from ufl.core.base_form_operator import BaseFormOperator
+        base_form_ops = extract_type(self, BaseFormOperator)
+        self._base_form_operators = tuple(sorted_by_count(base_form_ops))
 
     def _compute_renumbering(self):
         """Compute renumbering."""
@@ -668,7 +670,7 @@ class Form(BaseForm):
 
         # Add domains of constants, these may include domains not
         # among integration domains
-        for c in self._constants:
+        for c in self.constants():
             d = extract_unique_domain(c)
             if d is not None and d not in renumbering:
                 renumbering[d] = k
@@ -787,8 +789,7 @@ class FormSum(BaseForm):
         # Define canonical numbering of arguments and coefficients
         self._arguments = tuple(
             sorted(set(arguments), key=lambda x: x.number()))
-        self._coefficients = tuple(
-            sorted(set(coefficients), key=lambda x: x.count()))
+        self._coefficients = tuple(sorted_by_count(set(coefficients)))
 
     def _analyze_domains(self):
         """Analyze which domains can be found in FormSum."""
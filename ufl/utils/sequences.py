@@ -19,6 +19,19 @@ def product(sequence):
     return p
 
 
+def balanced_sum(sequence):
+    """Return the sum of all elements in a sequence, added pairwise to keep the sum tree shallow."""
+    terms = list(sequence)
+    if not terms:
+        return 0
+    while len(terms) > 1:
+        pairs = [a + b for a, b in zip(terms[0::2], terms[1::2])]
+        if len(terms) % 2:
+            pairs.append(terms[-1])
+        terms = pairs
+    return terms[0]
+
+
 def max_degree(degrees):
     """Maximum degree for mixture of scalar and tuple degrees."""
     # numpy.maximum broadcasts scalar degrees to tuple degrees if
@@ -7,6 +7,7 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
 import warnings
+from operator import methodcaller
 
 
 def topological_sorting(nodes, edges):
@@ -41,9 +42,13 @@ def topological_sorting(nodes, edges):
     return L
 
 
+# Sort key calling item.count() without a Python level lambda
+_count_key = methodcaller("count")
+
+
 def sorted_by_count(seq):
     """Sort a sequence by the item.count()."""
-    return sorted(seq, key=lambda x: x.count())
+    return sorted(seq, key=_count_key)
 
 
 def sorted_by_key(mapping):